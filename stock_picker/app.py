@@ -2,6 +2,7 @@ import gradio as gr
 import os
 import sys
 import re
+import uuid
 from datetime import datetime
 from pathlib import Path
 
@@ -9,7 +10,9 @@ from pathlib import Path
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
-from crew import StockPicker
+from crew import StockPicker, MultiSectorStockPicker
+from utils import normalize_sector
+from warmer import warmer_from_env
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail, Email, To, Content
 
@@ -22,6 +25,23 @@ print(f"SENDGRID_API_KEY: {'✅ Set' if os.environ.get('SENDGRID_API_KEY') else
 print(f"FROM_EMAIL: {'✅ Set' if os.environ.get('FROM_EMAIL') else '❌ Missing'}")
 print("=" * 50)
 
+# Sectors that receive nearly all of our traffic - shown as examples and pre-warmed off-peak
+POPULAR_SECTORS = [
+    "Technology",
+    "Healthcare",
+    "Energy",
+    "Finance",
+    "Consumer Goods",
+    "Real Estate",
+    "Artificial Intelligence",
+    "Renewable Energy",
+    "Biotechnology",
+    "Cybersecurity",
+]
+
+# Cap on comma-separated sectors per request, so one research task stays within the model's output limits
+MAX_SECTORS = 5
+
 def send_email(to_email, subject, html_content):
     """Send email using SendGrid - The notification delivery system"""
     try:
@@ -363,6 +383,29 @@ def format_result_as_html(result, sector):
     """
     return html
 
+def new_output_dir(label):
+    """A fresh output/ subdirectory per run, so parallel crews never share report files"""
+    slug = re.sub(r'[^a-z0-9]+', '-', label.lower()).strip('-')[:40]
+    return os.path.join('output', f"{datetime.now():%Y%m%d-%H%M%S}-{slug}-{uuid.uuid4().hex[:6]}")
+
+def run_crew(sector):
+    """Run the full crew for one sector and return the raw report - The kitchen at work"""
+    stock_picker_crew = StockPicker()
+    stock_picker_crew.output_dir = new_output_dir(sector)
+    crew_instance = stock_picker_crew.crew()
+    result = crew_instance.kickoff(inputs={'sector': sector})
+    return result.raw if hasattr(result, 'raw') else str(result)
+
+def run_multi_sector_crew(sectors):
+    """Run one shared discovery and research pass across several sectors - The banquet kitchen"""
+    multi_sector_crew = MultiSectorStockPicker()
+    multi_sector_crew.output_dir = new_output_dir('-'.join(sectors))
+    result = multi_sector_crew.run(sectors)
+    return result.raw if hasattr(result, 'raw') else str(result)
+
+# Off-peak scheduler that pre-cooks reports for popular sectors (None when WARM_SCHEDULE=off)
+cache_warmer = warmer_from_env(run_crew, POPULAR_SECTORS)
+
 def run_stock_analysis(email, sector, progress=gr.Progress()):
     """Main function to run stock analysis - The kitchen coordinator"""
     
@@ -370,31 +413,37 @@ def run_stock_analysis(email, sector, progress=gr.Progress()):
     if not email or '@' not in email:
         return "❌ Please enter a valid email address.", "❌ Invalid input"
     
-    if not sector or len(sector.strip()) == 0:
+    # Comma-separated sectors are compared in one multi-sector run - A banquet order
+    sectors = list({normalize_sector(s): s.strip() for s in (sector or '').split(',') if s.strip()}.values())
+    if not sectors:
         return "❌ Please enter an investment sector.", "❌ Invalid input"
+    if len(sectors) > MAX_SECTORS:
+        return f"❌ Please compare at most {MAX_SECTORS} sectors at a time.", "❌ Invalid input"
+    sector = ', '.join(sectors)
     
     try:
         # Update progress - Kitchen is opening
         progress(0.1, desc="🚀 Initializing AI agents (Opening the kitchen)...")
         
-        # Prepare inputs - Getting the order ready
-        inputs = {
-            'sector': sector.strip()
-        }
+        # Serve a pre-warmed report if one is ready - The dish was prepared this morning
+        warmed = cache_warmer.cache.get(sector) if cache_warmer and cache_warmer.covers(sector) else None
         
-        # Update progress - Ingredient sourcing begins
-        progress(0.3, desc="🔍 Finding trending companies (Sourcing fresh ingredients)...")
-        
-        # Run the crew - The kitchen starts working!
-        stock_picker_crew = StockPicker()
-        crew_instance = stock_picker_crew.crew()
-        result = crew_instance.kickoff(inputs=inputs)
-        
-        # Update progress - Quality inspection phase
-        progress(0.7, desc="📊 Analyzing investment opportunities (Inspecting quality)...")
-        
-        # Get the output - The final dish is ready
-        output = result.raw if hasattr(result, 'raw') else str(result)
+        if warmed:
+            output, generated_at = warmed
+        else:
+            # Update progress - Ingredient sourcing begins
+            progress(0.3, desc="🔍 Finding trending companies (Sourcing fresh ingredients)...")
+            
+            # Run the crew - The kitchen starts working!
+            if cache_warmer and cache_warmer.covers(sector):
+                # Joins a warm already cooking this sector, and keeps the dish warm for the next customer
+                output, generated_at = cache_warmer.run_once(sector)
+            else:
+                output = run_multi_sector_crew(sectors) if len(sectors) > 1 else run_crew(sector)
+                generated_at = datetime.now()
+            
+            # Update progress - Quality inspection phase
+            progress(0.7, desc="📊 Analyzing investment opportunities (Inspecting quality)...")
         
         # Update progress - Plating and delivery
         progress(0.9, desc="📧 Sending email (Delivering the dish)...")
@@ -421,7 +470,7 @@ def run_stock_analysis(email, sector, progress=gr.Progress()):
 ## 📈 Stock Investment Recommendation
 
 **Sector:** `{sector}`  
-**Analysis Date:** {datetime.now().strftime("%B %d, %Y at %I:%M %p")}  
+**Analysis Date:** {generated_at.strftime("%B %d, %Y at %I:%M %p")}{" (pre-generated)" if warmed else ""}  
 **Delivered to:** {email}
 
 ---
@@ -478,6 +527,8 @@ with gr.Blocks(theme=gr.themes.Soft(), title="AI Stock Picker", css="""
         4. **Head Chef** (stock_picker) selects the best investment
         5. **Manager** coordinates the entire workflow
         6. **Receive** detailed analysis via email and in-app
+        
+        💡 Enter several sectors separated by commas (e.g. *Technology, Artificial Intelligence, Cybersecurity*) to get a pick per sector plus a cross-sector comparison.
         """
     )
     
@@ -494,25 +545,14 @@ with gr.Blocks(theme=gr.themes.Soft(), title="AI Stock Picker", css="""
             
             sector_input = gr.Textbox(
                 label="💼 Investment Sector",
-                placeholder="e.g., Technology, Healthcare, Energy",
-                info="Which sector interests you?",
+                placeholder="e.g., Technology",
+                info="Which sector interests you? Separate several with commas to compare them",
                 lines=1
             )
             
             gr.Markdown("**💡 Popular sectors:**")
             sector_examples = gr.Examples(
-                examples=[
-                    ["Technology"],
-                    ["Healthcare"],
-                    ["Energy"],
-                    ["Finance"],
-                    ["Consumer Goods"],
-                    ["Real Estate"],
-                    ["Artificial Intelligence"],
-                    ["Renewable Energy"],
-                    ["Biotechnology"],
-                    ["Cybersecurity"]
-                ],
+                examples=[[s] for s in POPULAR_SECTORS],
                 inputs=[sector_input],
                 label=""
             )
@@ -582,6 +622,9 @@ with gr.Blocks(theme=gr.themes.Soft(), title="AI Stock Picker", css="""
 
 # Launch the app - Open for business!
 if __name__ == "__main__":
+    # Start the off-peak prep shift
+    if cache_warmer:
+        cache_warmer.start()
     demo.launch(
         server_name="0.0.0.0",
         server_port=7860,
@@ -1,9 +1,12 @@
 from logging import Manager
+import re
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
-from pydantic import BaseModel, Field, config
+from pydantic import BaseModel, Field, ValidationError, config
 from typing import List
+from pathlib import Path
 from crewai_tools import SuperDevTool
+from utils import company_label, deduplicate_companies
 
 
 class TrendingCompany(BaseModel):
@@ -27,6 +30,15 @@ class TrendingCompanyResearchList(BaseModel):
     """ A list of detailed research on all the companies """
     research_list: List[TrendingCompanyResearch] = Field(description="Comprehensive research on all trending companies")
 
+class SectorTrendingCompanies(BaseModel):
+    """ Trending companies found for one sector """
+    sector: str = Field(description="Sector name")
+    companies: List[TrendingCompany] = Field(description="List of companies trending in the news in this sector")
+
+class SectorTrendingCompanyList(BaseModel):
+    """ Trending companies for each of several sectors, found in one pass """
+    sectors: List[SectorTrendingCompanies] = Field(description="Trending companies grouped by sector")
+
 
 @CrewBase
 class StockPicker():
@@ -34,6 +46,12 @@ class StockPicker():
 
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
+    # Set per run before calling crew() so concurrent crews don't overwrite each other's files
+    output_dir = 'output'
+
+    def output_file(self, task_name):
+        """The task's configured output file, placed under this run's output_dir"""
+        return str(Path(self.output_dir) / Path(self.tasks_config[task_name]['output_file']).name)
 
     @agent
     def trending_company_finder(self) -> Agent:
@@ -70,6 +88,7 @@ class StockPicker():
         return Task(
             config=self.tasks_config['find_trending_companies'],
             output_pydantic=TrendingCompanyList,
+            output_file=self.output_file('find_trending_companies'),
         )
 
     @task
@@ -77,12 +96,14 @@ class StockPicker():
         return Task(
             config=self.tasks_config['research_trending_companies'],
             output_pydantic=TrendingCompanyResearchList,
+            output_file=self.output_file('research_trending_companies'),
         )
 
     @task
     def pick_best_company(self) -> Task:
         return Task(
-            config=self.tasks_config['pick_best_company']
+            config=self.tasks_config['pick_best_company'],
+            output_file=self.output_file('pick_best_company'),
         )
 
     @crew
@@ -100,3 +121,128 @@ class StockPicker():
             verbose=True,
             manager_agent = manager,
         )
+
+
+@CrewBase
+class MultiSectorStockPicker():
+    """Multi-sector crew: one discovery pass, one research pass over distinct companies, one pick per sector"""
+
+    agents_config = 'config/agents.yaml'
+    tasks_config = 'config/multi_sector_tasks.yaml'
+    # Set per run before kicking off so concurrent crews don't overwrite each other's files
+    output_dir = 'output'
+
+    def output_file(self, task_name):
+        """The task's configured output file, placed under this run's output_dir"""
+        return str(Path(self.output_dir) / Path(self.tasks_config[task_name]['output_file']).name)
+
+    @agent
+    def multi_sector_company_finder(self) -> Agent:
+        return Agent(
+            config=self.agents_config['multi_sector_company_finder'],
+            tools = [SuperDevTool()],
+            verbose=True
+        )
+
+    @agent
+    def financial_researcher(self) -> Agent:
+        return Agent(
+            config=self.agents_config['financial_researcher'],
+            tools = [SuperDevTool()],
+            verbose=True
+        )
+
+    @agent
+    def stock_picker(self) -> Agent:
+        return Agent(
+            config=self.agents_config['stock_picker'],
+            verbose=True
+        )
+
+    @task
+    def find_trending_companies_by_sector(self) -> Task:
+        return Task(
+            config=self.tasks_config['find_trending_companies_by_sector'],
+            output_pydantic=SectorTrendingCompanyList,
+            output_file=self.output_file('find_trending_companies_by_sector'),
+        )
+
+    @task
+    def research_trending_companies(self) -> Task:
+        return Task(
+            config=self.tasks_config['research_trending_companies'],
+            output_pydantic=TrendingCompanyResearchList,
+            output_file=self.output_file('research_trending_companies'),
+        )
+
+    @task
+    def pick_best_company_per_sector(self) -> Task:
+        return Task(
+            config=self.tasks_config['pick_best_company_per_sector'],
+            output_file=self.output_file('pick_best_company_per_sector'),
+        )
+
+    def discovery_crew(self) -> Crew:
+        """Finds trending companies for all sectors in a single task"""
+        return Crew(
+            agents=[self.multi_sector_company_finder()],
+            tasks=[self.find_trending_companies_by_sector()],
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    def analysis_crew(self) -> Crew:
+        """Researches the deduplicated companies once, then picks per sector and compares"""
+        return Crew(
+            agents=[self.financial_researcher(), self.stock_picker()],
+            tasks=[self.research_trending_companies(), self.pick_best_company_per_sector()],
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    def discover(self, sectors: List[str]) -> List[SectorTrendingCompanies]:
+        """Run the discovery stage for these sectors and return the trending companies per sector"""
+        result = self.discovery_crew().kickoff(inputs={'sector': ', '.join(sectors)})
+        if result.pydantic is not None:
+            return result.pydantic.sectors
+
+        # The finder doesn't always honour the output schema; retry the parse on the raw text
+        match = re.search(r'\{.*\}', result.raw or '', re.DOTALL)
+        try:
+            return SectorTrendingCompanyList.model_validate_json(match.group(0)).sectors
+        except (AttributeError, ValidationError):
+            raise ValueError(
+                f"Discovery stage returned no parseable company list for: {', '.join(sectors)}"
+            )
+
+    def run(self, sectors: List[str]):
+        """Run the multi-sector analysis and return the final crew output"""
+        groups = self.discover(sectors)
+
+        # Sectors the finder dropped or renamed get one more, targeted discovery pass
+        _, sector_companies = deduplicate_companies(groups, sectors)
+        missing = [sector for sector, found in sector_companies.items() if not found]
+        if missing:
+            try:
+                groups += self.discover(missing)
+            except ValueError as e:
+                print(f"Warning: {str(e)}")
+            # The retry overwrote the discovery output file with only the missing sectors
+            output_file = Path(self.output_file('find_trending_companies_by_sector'))
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            output_file.write_text(SectorTrendingCompanyList(sectors=groups).model_dump_json(indent=2))
+
+        companies, sector_companies = deduplicate_companies(groups, sectors)
+        if not companies:
+            raise ValueError(f"Discovery stage found no trending companies for: {', '.join(sectors)}")
+
+        inputs = {
+            'companies': '\n'.join(
+                f"- {company_label(c)}: {c.reason}" for c in companies.values()
+            ),
+            'sector_companies': '\n'.join(
+                f"- {sector}: {', '.join(company_label(c) for c in found) if found else 'no trending companies found'}"
+                for sector, found in sector_companies.items()
+            ),
+        }
+        return self.analysis_crew().kickoff(inputs=inputs)
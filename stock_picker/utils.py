@@ -0,0 +1,53 @@
+import re
+
+
+# Symbols the finder returns for companies that have no listed ticker
+NON_TICKERS = {'', 'N/A', 'NA', 'NONE', 'NULL', 'PRIVATE', 'UNLISTED', 'TBD', '-'}
+
+_TICKER = re.compile(r'^[A-Z0-9][A-Z0-9.\-]{0,9}$')
+
+
+def normalize_sector(sector):
+    """Normalize a sector name so 'technology ' and 'Technology' share a cache entry"""
+    return ' '.join(sector.split()).lower()
+
+
+def normalize_ticker(ticker):
+    """Return the bare upper-case ticker ("NASDAQ:nvda" -> "NVDA"), or None if it isn't a real ticker"""
+    ticker = (ticker or '').split(':')[-1].strip().upper()
+    if ticker in NON_TICKERS or not _TICKER.match(ticker):
+        return None
+    return ticker
+
+
+def company_key(company):
+    """Identity for deduplication: the ticker when there is one, otherwise the normalized name"""
+    ticker = normalize_ticker(company.ticker)
+    if ticker:
+        return ticker
+    return 'name:' + ' '.join(company.name.split()).lower()
+
+
+def company_label(company):
+    """How a company is shown to the agents, e.g. "NVIDIA (NVDA)" or "Anthropic (private)" """
+    ticker = normalize_ticker(company.ticker)
+    return f"{company.name} ({ticker or 'private'})"
+
+
+def deduplicate_companies(groups, sectors):
+    """ Merge per-sector discoveries into one list of distinct companies.
+    Groups are matched back to the requested sectors; groups for sectors that weren't requested are ignored.
+    Returns a mapping of company key -> company and a mapping of every requested sector -> its companies. """
+    requested = {normalize_sector(sector): sector for sector in sectors}
+    companies = {}
+    sector_companies = {sector: [] for sector in sectors}
+    for group in groups:
+        sector = requested.get(normalize_sector(group.sector))
+        if sector is None:
+            continue
+        found = sector_companies[sector]
+        for company in group.companies:
+            company = companies.setdefault(company_key(company), company)
+            if not any(c is company for c in found):
+                found.append(company)
+    return companies, sector_companies
@@ -0,0 +1,240 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from utils import normalize_sector
+
+
+def _parse_cron_field(field, low, high):
+    """Expand one cron field (*, n, a-b, */s, a-b/s, n/s, comma lists) into a set of values"""
+    values = set()
+    for item in field.split(','):
+        try:
+            part, stepped, step = item.partition('/')
+            step = int(step) if stepped else 1
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = (int(v) for v in part.split('-', 1))
+            else:
+                start = int(part)
+                # As in cron, a bare "n/s" runs from n to the end of the range
+                end = high if stepped else start
+        except ValueError:
+            raise ValueError(f"Cron field '{field}' has an invalid item '{item}'")
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Cron field '{field}' out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Minimal 5-field cron expression: minute hour day-of-month month day-of-week"""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have 5 fields")
+        self.expression = expression
+        self.minutes = _parse_cron_field(fields[0], 0, 59)
+        self.hours = _parse_cron_field(fields[1], 0, 23)
+        self.days = _parse_cron_field(fields[2], 1, 31)
+        self.months = _parse_cron_field(fields[3], 1, 12)
+        # Cron uses 0 (or 7) for Sunday; Python's weekday() uses 6
+        self.weekdays = {(d - 1) % 7 for d in _parse_cron_field(fields[4], 0, 7)}
+        # As in standard cron, a day matches either field when both are restricted
+        self.either_day = not fields[2].startswith('*') and not fields[4].startswith('*')
+
+    def _day_matches(self, day):
+        in_days = day.day in self.days
+        in_weekdays = day.weekday() in self.weekdays
+        if self.either_day:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def matches(self, moment):
+        return (moment.minute in self.minutes
+                and moment.hour in self.hours
+                and moment.month in self.months
+                and self._day_matches(moment))
+
+    def next_run(self, after):
+        """Return the first matching minute strictly after `after`"""
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        # Leap days can be 8 years apart (2096 -> 2104), so search that far day by day
+        for _ in range(366 * 8):
+            if day.month in self.months and self._day_matches(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        moment = day.replace(hour=hour, minute=minute)
+                        if moment >= start:
+                            return moment
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression '{self.expression}' has no match in the next 8 years")
+
+
+class ReportCache:
+    """Thread-safe in-memory store of finished reports, keyed by normalized sector"""
+
+    def __init__(self, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, sector):
+        """Return (output, generated_at) if a fresh report exists, else None"""
+        with self._lock:
+            entry = self._entries.get(normalize_sector(sector))
+        if entry is None:
+            return None
+        output, generated_at, expires_at = entry
+        if datetime.now() > expires_at:
+            return None
+        return output, generated_at
+
+    def put(self, sector, output, expires_at=None):
+        """Store a report, served until `expires_at` (default: the TTL from now)"""
+        now = datetime.now()
+        if expires_at is None:
+            expires_at = now + timedelta(seconds=self.ttl_seconds)
+        with self._lock:
+            self._entries[normalize_sector(sector)] = (output, now, expires_at)
+
+
+# Allowance for a scheduled warm's crew run to finish before the report it replaces expires
+WARM_MARGIN = timedelta(hours=1)
+
+
+class CacheWarmer:
+    """Background scheduler that refreshes reports for popular sectors off-peak"""
+
+    def __init__(self, run_report, sectors, schedule, cache, max_concurrency=2, jitter_seconds=300,
+                 warm_on_start=False):
+        # Fail at startup rather than in the background thread if the schedule can't be met
+        schedule.next_run(datetime.now())
+        self.run_report = run_report
+        unique = {}
+        for sector in sectors:
+            if sector.strip():
+                unique.setdefault(normalize_sector(sector), sector.strip())
+        self.sectors = list(unique.values())
+        self.schedule = schedule
+        self.cache = cache
+        self.max_concurrency = max(1, max_concurrency)
+        self.jitter_seconds = max(0, jitter_seconds)
+        self.warm_on_start = warm_on_start
+        self._warm_keys = {normalize_sector(s) for s in self.sectors}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def covers(self, sector):
+        """Whether this sector is part of the warmed set"""
+        return normalize_sector(sector) in self._warm_keys
+
+    def run_once(self, sector):
+        """Run the crew for a sector and cache the report, returning (output, generated_at)
+
+        If a run for the same sector is already in flight (a warm or another request),
+        wait for it and share its result instead of starting a duplicate run.
+        """
+        key = normalize_sector(sector)
+        while True:
+            with self._lock:
+                running = self._in_flight.get(key)
+                if running is None:
+                    done = self._in_flight[key] = threading.Event()
+                    break
+            running.wait()
+            shared = self.cache.get(sector)
+            if shared:
+                return shared
+            # The run we waited on failed - try again ourselves
+
+        try:
+            output = self.run_report(sector)
+            self.cache.put(sector, output, expires_at=self._expires_at())
+            return output, datetime.now()
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            done.set()
+
+    def _expires_at(self):
+        """Serve a report for at least the TTL, and until the next scheduled warm has had time to replace it"""
+        now = datetime.now()
+        next_warm = self.schedule.next_run(now) + timedelta(seconds=self.jitter_seconds) + WARM_MARGIN
+        return max(now + timedelta(seconds=self.cache.ttl_seconds), next_warm)
+
+    def _warm_sector(self, sector):
+        # Jitter spreads the batch out so we don't hit provider rate limits in one burst
+        if self._stop.wait(random.uniform(0, self.jitter_seconds)):
+            return
+        try:
+            started = time.time()
+            self.run_once(sector)
+            print(f"Cache warmer: refreshed '{sector}' in {time.time() - started:.0f}s")
+        except Exception as e:
+            print(f"Cache warmer: failed to refresh '{sector}': {str(e)}")
+
+    def warm_all(self):
+        """Refresh every configured sector, at most `max_concurrency` crews at a time"""
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="cache-warmer") as pool:
+            list(pool.map(self._warm_sector, self.sectors))
+
+    def _loop(self):
+        # Opt-in: fills the in-memory cache after a restart, but runs every crew at start time, not off-peak
+        if self.warm_on_start:
+            self.warm_all()
+        while not self._stop.is_set():
+            try:
+                next_run = self.schedule.next_run(datetime.now())
+                print(f"Cache warmer: next refresh of {len(self.sectors)} sectors at {next_run:%Y-%m-%d %H:%M}")
+                if self._stop.wait((next_run - datetime.now()).total_seconds()):
+                    return
+                self.warm_all()
+            except Exception as e:
+                # Keep the scheduler alive; back off briefly before recomputing the next run
+                print(f"Cache warmer: scheduler error: {str(e)}")
+                self._stop.wait(60)
+
+    def start(self):
+        if self._thread is None and self.sectors:
+            self._thread = threading.Thread(target=self._loop, name="cache-warmer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+def warmer_from_env(run_report, default_sectors):
+    """Build a CacheWarmer from environment variables, or return None if disabled
+
+    WARM_SCHEDULE     cron expression in server local time (default "0 4 * * *", "off" disables)
+    WARM_SECTORS      comma-separated sectors (default: the app's popular sectors)
+    WARM_CONCURRENCY  max crews running at once (default 2)
+    WARM_JITTER       max random delay in seconds before each sector starts (default 300)
+    WARM_TTL_HOURS    minimum time a report is served; warmed reports also last until the next scheduled warm (default 24)
+    WARM_ON_START     also warm once when the app starts, at full crew cost (default false)
+    """
+    expression = os.environ.get('WARM_SCHEDULE', '0 4 * * *').strip()
+    if not expression or expression.lower() in ('off', 'false', 'none', '0'):
+        return None
+
+    sectors_env = os.environ.get('WARM_SECTORS')
+    sectors = sectors_env.split(',') if sectors_env else default_sectors
+
+    return CacheWarmer(
+        run_report=run_report,
+        sectors=sectors,
+        schedule=CronSchedule(expression),
+        cache=ReportCache(ttl_seconds=float(os.environ.get('WARM_TTL_HOURS', '24')) * 3600),
+        max_concurrency=int(os.environ.get('WARM_CONCURRENCY', '2')),
+        jitter_seconds=float(os.environ.get('WARM_JITTER', '300')),
+        warm_on_start=os.environ.get('WARM_ON_START', 'false').strip().lower() in ('true', 'on', 'yes', '1'),
+    )
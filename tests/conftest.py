@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules import each other flat (as app.py does), so put stock_picker/ on the path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'stock_picker'))
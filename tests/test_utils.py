@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+from utils import company_key, company_label, deduplicate_companies, normalize_ticker
+
+
+def company(name, ticker):
+    return SimpleNamespace(name=name, ticker=ticker, reason="in the news")
+
+
+def group(sector, *companies):
+    return SimpleNamespace(sector=sector, companies=list(companies))
+
+
+def test_normalize_ticker():
+    assert normalize_ticker('NASDAQ:nvda') == 'NVDA'
+    assert normalize_ticker(' BRK.B ') == 'BRK.B'
+    for placeholder in ['', 'N/A', 'Private', 'unlisted', 'None', None]:
+        assert normalize_ticker(placeholder) is None
+
+
+def test_same_ticker_is_researched_once():
+    nvda = company('NVIDIA', 'NVDA')
+    companies, sector_companies = deduplicate_companies(
+        [group('Technology', nvda), group('artificial intelligence', company('Nvidia Corp', 'NASDAQ:NVDA'))],
+        ['Technology', 'Artificial Intelligence'],
+    )
+    assert list(companies.values()) == [nvda]
+    assert sector_companies == {'Technology': [nvda], 'Artificial Intelligence': [nvda]}
+
+
+def test_private_companies_are_kept_apart():
+    openai = company('OpenAI', 'Private')
+    anthropic = company('Anthropic', 'Private')
+    mistral = company('Mistral AI', 'N/A')
+    companies, sector_companies = deduplicate_companies(
+        [group('Artificial Intelligence', openai, anthropic, mistral, company(' openai ', ''))],
+        ['Artificial Intelligence'],
+    )
+    assert list(companies.values()) == [openai, anthropic, mistral]
+    assert sector_companies['Artificial Intelligence'] == [openai, anthropic, mistral]
+    assert company_key(openai) != company_key(anthropic)
+    assert company_label(anthropic) == 'Anthropic (private)'
+
+
+def test_unrequested_and_missing_sectors():
+    companies, sector_companies = deduplicate_companies(
+        [group('AI', company('NVIDIA', 'NVDA'))],
+        ['Artificial Intelligence', 'Energy'],
+    )
+    assert companies == {}
+    assert sector_companies == {'Artificial Intelligence': [], 'Energy': []}
@@ -0,0 +1,129 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from warmer import WARM_MARGIN, CacheWarmer, CronSchedule, ReportCache, _parse_cron_field
+
+
+# 2026-10-19 is a Monday
+MONDAY = datetime(2026, 10, 19, 12, 0)
+
+
+def test_parse_cron_field_steps_and_ranges():
+    assert sorted(_parse_cron_field('5/10', 0, 59)) == [5, 15, 25, 35, 45, 55]
+    assert sorted(_parse_cron_field('1-10/3', 0, 59)) == [1, 4, 7, 10]
+    assert sorted(_parse_cron_field('*/20', 0, 59)) == [0, 20, 40]
+    assert _parse_cron_field('1,3', 0, 59) == {1, 3}
+
+
+@pytest.mark.parametrize('field', ['1,,2', 'a', '5/', '', '60', '5-1'])
+def test_parse_cron_field_rejects_bad_items(field):
+    with pytest.raises(ValueError, match='Cron field'):
+        _parse_cron_field(field, 0, 59)
+
+
+def test_next_run_daily():
+    assert CronSchedule('0 4 * * *').next_run(MONDAY) == datetime(2026, 10, 20, 4, 0)
+
+
+def test_next_run_is_strictly_after():
+    assert CronSchedule('0 12 * * *').next_run(MONDAY) == datetime(2026, 10, 20, 12, 0)
+
+
+def test_next_run_sunday_is_0_and_7():
+    sunday = datetime(2026, 10, 25, 4, 0)
+    assert CronSchedule('0 4 * * 0').next_run(MONDAY) == sunday
+    assert CronSchedule('0 4 * * 7').next_run(MONDAY) == sunday
+
+
+def test_next_run_day_of_month_or_day_of_week():
+    # Both restricted: the 1st of the month OR any Monday
+    assert CronSchedule('0 4 1 * 1').next_run(MONDAY) == datetime(2026, 10, 26, 4, 0)
+    assert CronSchedule('0 4 1 * 1').next_run(datetime(2026, 10, 27)) == datetime(2026, 11, 1, 4, 0)
+    # Only day-of-month restricted: just the 1st
+    assert CronSchedule('0 4 1 * *').next_run(MONDAY) == datetime(2026, 11, 1, 4, 0)
+
+
+def test_next_run_finds_leap_day():
+    assert CronSchedule('0 0 29 2 *').next_run(MONDAY) == datetime(2028, 2, 29, 0, 0)
+
+
+def test_next_run_impossible_date():
+    with pytest.raises(ValueError, match='no match'):
+        CronSchedule('0 0 31 2 *').next_run(MONDAY)
+
+
+def test_warmer_rejects_unmeetable_schedule():
+    with pytest.raises(ValueError):
+        CacheWarmer(lambda sector: sector, ['Energy'], CronSchedule('0 0 31 2 *'), ReportCache(3600))
+
+
+def test_run_once_shares_concurrent_runs():
+    calls = []
+
+    def run_report(sector):
+        calls.append(sector)
+        time.sleep(0.2)
+        return f"report for {sector}"
+
+    warmer = CacheWarmer(run_report, ['Energy'], CronSchedule('0 4 * * *'), ReportCache(3600))
+    results = []
+    threads = [threading.Thread(target=lambda s=s: results.append(warmer.run_once(s)[0]))
+               for s in ['Energy', 'energy ', ' ENERGY']]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["report for Energy"] * 3
+
+
+def test_run_once_retries_after_shared_run_fails():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def run_report(sector):
+        calls.append(sector)
+        if len(calls) == 1:
+            started.set()
+            release.wait()
+            raise RuntimeError("provider down")
+        return "second try"
+
+    warmer = CacheWarmer(run_report, ['Energy'], CronSchedule('0 4 * * *'), ReportCache(3600))
+    errors = []
+
+    def first_run():
+        try:
+            warmer.run_once('Energy')
+        except RuntimeError as e:
+            errors.append(e)
+
+    first = threading.Thread(target=first_run)
+    first.start()
+    started.wait()
+    result = []
+    second = threading.Thread(target=lambda: result.append(warmer.run_once('Energy')[0]))
+    second.start()
+    time.sleep(0.05)
+    release.set()
+    first.join()
+    second.join()
+
+    assert len(errors) == 1
+    assert result == ["second try"]
+    assert len(calls) == 2
+
+
+def test_warmed_report_lasts_until_next_scheduled_warm():
+    cache = ReportCache(ttl_seconds=3600)
+    warmer = CacheWarmer(lambda sector: "weekly", ['Energy'], CronSchedule('0 4 * * 1'), cache,
+                         jitter_seconds=0)
+    warmer.run_once('Energy')
+    _, _, expires_at = cache._entries['energy']
+    assert expires_at >= warmer.schedule.next_run(datetime.now()) + WARM_MARGIN
+    assert expires_at >= datetime.now() + timedelta(minutes=59)